@@ -0,0 +1,17 @@
+"""
+This module provides the botocore configuration shared by the AWS clients.
+
+Constants:
+    - BOTO_CONFIG: Client configuration that keeps connections alive between
+      invocations of the same container and retries throttled calls adaptively.
+"""
+from botocore.config import Config
+
+# Keep connections alive between invocations of the same container
+BOTO_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    connect_timeout=5,
+    read_timeout=60,
+    retries={'max_attempts': 10, 'mode': 'adaptive'}
+)
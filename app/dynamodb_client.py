@@ -1,12 +1,21 @@
 """
 This module provides a client for interacting with AWS DynamoDB.
 
-The DynamoDBClient class allows performing operations such as inserting items
-into DynamoDB tables. It uses the default AWS credential resolution chain to
-securely obtain credentials and provides error handling for common issues.
+The DynamoDBClient class allows performing operations such as inserting items,
+individually or in batches, into DynamoDB tables. It uses the default AWS
+credential resolution chain to securely obtain credentials and provides error
+handling for common issues.
 """
 
+import random
+import time
 import boto3
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+from aws_config import BOTO_CONFIG
+
+# Maximum number of items accepted by a single BatchWriteItem request
+BATCH_WRITE_LIMIT = 25
 
 class DynamoDBClient:
     """
@@ -21,26 +30,92 @@ class DynamoDBClient:
         The credentials are automatically resolved from environment variables,
         AWS credentials file, IAM roles, or other supported methods.
         """
-        self.dynamodb = boto3.resource('dynamodb')
+        self.dynamodb = boto3.resource('dynamodb', config=BOTO_CONFIG)
+        self._tables = {}
+
+    def _table(self, table_name):
+        """
+        Return the Table resource for a table name, creating it on first use.
+
+        :param table_name: Name of the DynamoDB table
+        :return: The cached DynamoDB Table resource
+        """
+        table = self._tables.get(table_name)
+        if table is None:
+            table = self._tables[table_name] = self.dynamodb.Table(table_name)
+        return table
 
-    def put_item(self, table_name, item):
+    def put_item(self, table_name, item, unique_key=None):
         """
         Insert an item into a DynamoDB table.
 
         :param table_name: Name of the DynamoDB table
         :param item: A dictionary representing the item to insert
+        :param unique_key: If given, the item is only written when no item with
+                           this key attribute exists yet
         :return: Response from DynamoDB if the operation is successful, else None
         """
         try:
-            table = self.dynamodb.Table(table_name)
-            response = table.put_item(Item=item)
-            return response
+            table = self._table(table_name)
+            if unique_key is None:
+                return table.put_item(Item=item)
+            return table.put_item(Item=item,
+                                  ConditionExpression=Attr(unique_key).not_exists())
+
+        except ClientError as error:
+            if error.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                print(f"Item already exists in DynamoDB table, skipping: {item[unique_key]}")
+            else:
+                print(f"Error putting item into DynamoDB table: {error}")
+            return None
 
         # pylint: disable=broad-exception-caught
         except Exception as error:
             print(f"Error putting item into DynamoDB table: {error}")
             return None
 
+    def put_items_batch(self, table_name, items, overwrite_by_pkeys=None, max_attempts=8):
+        """
+        Insert multiple items into a DynamoDB table using BatchWriteItem.
+
+        Items are sent in chunks of 25. Any UnprocessedItems returned because of
+        throttling are retried with jittered exponential backoff.
+
+        :param table_name: Name of the DynamoDB table
+        :param items: A list of dictionaries representing the items to insert
+        :param overwrite_by_pkeys: Primary key names used to de-duplicate items,
+                                   keeping the last one, since BatchWriteItem
+                                   rejects requests with duplicate keys
+        :param max_attempts: Maximum number of attempts for each chunk
+        :return: True if all items were written successfully, else False
+        """
+        if overwrite_by_pkeys:
+            items = list({tuple(item[key] for key in overwrite_by_pkeys): item
+                          for item in items}.values())
+
+        try:
+            client = self.dynamodb.meta.client
+            for start in range(0, len(items), BATCH_WRITE_LIMIT):
+                requests = [{'PutRequest': {'Item': item}}
+                            for item in items[start:start + BATCH_WRITE_LIMIT]]
+                for attempt in range(max_attempts):
+                    response = client.batch_write_item(RequestItems={table_name: requests})
+                    requests = response.get('UnprocessedItems', {}).get(table_name)
+                    if not requests:
+                        break
+                    if attempt < max_attempts - 1:
+                        time.sleep(min(2 ** attempt * 0.05 + random.random() * 0.05, 2.0))
+                else:
+                    print(f"{len(requests)} items left unprocessed in DynamoDB table "
+                          f"{table_name} after {max_attempts} attempts")
+                    return False
+            return True
+
+        # pylint: disable=broad-exception-caught
+        except Exception as error:
+            print(f"Error batch writing items into DynamoDB table: {error}")
+            return False
+
     def get_item(self, table_name, key):
         """
         Retrieve an item from a DynamoDB table.
@@ -50,7 +125,7 @@ class DynamoDBClient:
         :return: The retrieved item as a dictionary, or None if not found
         """
         try:
-            table = self.dynamodb.Table(table_name)
+            table = self._table(table_name)
             response = table.get_item(Key=key)
             return response.get('Item', None)
 
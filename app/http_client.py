@@ -12,11 +12,30 @@ Functions:
         with optional data, JSON payload, and headers.
         Returns the response object or None if the request fails.
 
+    - warm_up(url, connections=1, timeout=1):
+        Concurrently opens pooled connections to the specified URL without retries.
+        Returns the number of connections opened.
+
+Requests are sent through a shared, module-level session so that connections
+are pooled and reused across calls and Lambda invocations.
 """
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier, BrokenBarrierError
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError
+from urllib3.util import Timeout
+from urllib3.util.retry import Retry
 
 DEFAULT_TIMEOUT = 5  # Default timeout for requests in seconds
 
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=3, backoff_factor=0.2)
+))
+
 def get(url, params=None, headers=None, timeout=DEFAULT_TIMEOUT):
 
     """
@@ -29,7 +48,7 @@ def get(url, params=None, headers=None, timeout=DEFAULT_TIMEOUT):
     :return: Response object from the GET request.
     """
     try:
-        response = requests.get(url, params=params, headers=headers, timeout=timeout)
+        response = SESSION.get(url, params=params, headers=headers, timeout=timeout)
         response.raise_for_status()
         return response
     except requests.exceptions.RequestException as e:
@@ -49,9 +68,60 @@ def post(url, data=None, json=None, headers=None, timeout=DEFAULT_TIMEOUT):
     :return: Response object from the POST request.
     """
     try:
-        response = requests.post(url, data=data, json=json, headers=headers, timeout=timeout)
+        response = SESSION.post(url, data=data, json=json, headers=headers, timeout=timeout)
         response.raise_for_status()
         return response
     except requests.exceptions.RequestException as e:
         print(f"POST request failed: {e}")
         return None
+
+
+def warm_up(url, connections=1, timeout=1):
+    """
+    Opens connections to the specified URL in the shared session's pool.
+
+    HEAD requests are sent concurrently and straight through the pool with
+    retries disabled, so an unreachable host costs about one timeout. Each
+    connection is held until all requests have one, so that every request
+    opens its own connection.
+
+    :param url: The URL to open connections to.
+    :param connections: Number of connections to open.
+    :param timeout: Total timeout for each request in seconds.
+    :return: The number of connections opened.
+    """
+    adapter = SESSION.get_adapter(url)
+    request = requests.Request('HEAD', url).prepare()
+    try:
+        # Resolve TLS and proxy settings the way SESSION does, so the same pool is used
+        settings = SESSION.merge_environment_settings(url, {}, None, None, None)
+        pool = adapter.get_connection_with_tls_context(request, settings['verify'],
+                                                       proxies=settings['proxies'],
+                                                       cert=settings['cert'])
+        path = adapter.request_url(request, settings['proxies'])
+    except (HTTPError, requests.exceptions.RequestException) as e:
+        print(f"Warm-up request failed: {e}")
+        return 0
+
+    all_open = Barrier(connections, timeout=2 * timeout)
+
+    def open_connection(_):
+        response = None
+        try:
+            response = pool.urlopen('HEAD', path, retries=False, redirect=False,
+                                    timeout=Timeout(total=timeout),
+                                    preload_content=False, release_conn=False)
+        except HTTPError as e:
+            print(f"Warm-up request failed: {e}")
+        try:
+            all_open.wait()
+        except BrokenBarrierError:
+            pass
+        if response is None:
+            return False
+        response.drain_conn()
+        response.release_conn()
+        return True
+
+    with ThreadPoolExecutor(max_workers=connections) as executor:
+        return sum(executor.map(open_connection, range(connections)))
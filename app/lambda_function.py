@@ -9,14 +9,29 @@ Functions:
     - lambda_handler(event, context): Entry point for the Lambda function.
     - process_record(record): Processes a single SQS record by downloading and
       uploading the PDF file to S3.
+    - upload_pdf(url, filename): Streams a PDF file from its URL into S3.
+    - request_job_id(filename): Calls the DS API to create a job for a PDF file.
+    - write_job(file_id, job_id): Records the job ID of a judgement in DynamoDB.
 
 Dependencies:
     - boto3: AWS SDK for Python, used for interacting with S3.
-    - requests: Library for making HTTP requests to download PDF files.
-    - os, urllib.parse: Standard Python libraries for file and URL handling.
+    - orjson: Fast JSON library used to parse SQS messages and DS API payloads.
+    - aws_config: Shared botocore configuration for the S3 and DynamoDB clients.
+    - http_client: Shared pooled `requests` session used to download PDF files
+      and call the DS API.
+    - logging, os, re: Standard Python libraries for logging, configuration and
+      URL handling.
 
 Environment Variables:
     - BUCKET_NAME: The name of the S3 bucket where the PDF files will be uploaded.
+    - S3_USE_ACCELERATE: Set to 'true' to upload through the S3 Transfer
+      Acceleration endpoint when the input bucket is in another region.
+    - WRITE_MODE: How job IDs are written to DynamoDB, either 'update' (default)
+      to update an existing entry or 'put' to write the whole entry.
+
+Configuration:
+    - Memory: 3008 MB, set by the deploy workflow. Lambda scales CPU and network
+      bandwidth with memory, and the PDF download and upload are bandwidth-bound.
 
 Usage:
     This module is designed to be deployed as an AWS Lambda function. It expects
@@ -25,31 +40,159 @@ Usage:
     of the PDF file to be processed.
 """
 
+import calendar
+import logging
 import os
-from urllib.parse import urlparse
-from datetime import datetime
-import json
+import re
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache
+from threading import Lock, Thread
 import boto3
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+import orjson
 import requests
+from aws_config import BOTO_CONFIG
+from http_client import SESSION, warm_up
 
-s3 = boto3.client('s3')
-dynamodb = boto3.resource('dynamodb')
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
 
 # todos: replace resource names
-table = dynamodb.Table('judgements-table')
-
+TABLE_NAME = 'judgements-table'
 INPUT_BUCKET_NAME = 'judgement-pdfs'
 OUTPUT_BUCKET_NAME = 'judgement-jsons'
 
 DS_API_URL = 'https://jsonplaceholder.typicode.com/posts'
 
+# Transfer Acceleration must also be enabled on the bucket; it only helps when
+# the bucket is in a different region from the function
+S3_USE_ACCELERATE = os.environ.get('S3_USE_ACCELERATE', 'false').lower() == 'true'
+
+# 'update' sets the job fields on an existing entry, 'put' writes the whole entry
+WRITE_MODE = os.environ.get('WRITE_MODE', 'update')
+if WRITE_MODE not in ('update', 'put'):
+    raise ValueError(f"Unsupported WRITE_MODE '{WRITE_MODE}'")
+
+# Judgement filenames look like <diary>_<year>_..._<dd-MMM-yyyy>.pdf
+JUDGEMENT_FILENAME_RE = re.compile(
+    r'([^_]+)_([^_]+)_(?:.*_)?(\d{1,2}-[A-Z]{3}-\d{4})\.pdf',
+    re.IGNORECASE
+)
+
+# Month abbreviations used in judgement filenames, parsed without strptime
+MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
+}
+
+# SQS delivers at most 10 records per batch
+MAX_WORKERS = 10
+
+# Large PDFs are uploaded in concurrent 8 MiB parts. Up to MAX_WORKERS uploads
+# run at once, so the S3 connection pool must hold every part in flight
+UPLOAD_CONCURRENCY = 4
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=UPLOAD_CONCURRENCY,
+    use_threads=True
+)
+S3_CONFIG = Config(
+    max_pool_connections=MAX_WORKERS * UPLOAD_CONCURRENCY,
+    s3={
+        'use_accelerate_endpoint': S3_USE_ACCELERATE,
+        'addressing_style': 'virtual'
+    }
+)
+
+# Most recent judgement IDs known to have a job ID, oldest first
+PROCESSED_IDS = OrderedDict()
+PROCESSED_IDS_LOCK = Lock()
+MAX_PROCESSED_IDS = 10000
+
+# Warm-up at init: DS API requests are single attempts with a short timeout,
+# and init waits at most WARM_UP_BUDGET seconds for the S3 request
+WARM_UP_TIMEOUT = 1
+WARM_UP_BUDGET = 3
+
+# Runs PDF uploads alongside the DS API call of the same record
+UPLOAD_EXECUTOR = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+
+
+@lru_cache(maxsize=None)
+def get_s3_client():
+    """
+    Returns the S3 client shared by every invocation in this container.
+
+    The client is pinned to the function's region and uses virtual-hosted
+    addressing, plus the accelerate endpoint if S3_USE_ACCELERATE is set.
+
+    Returns:
+        botocore.client.S3: The S3 client.
+    """
+    return boto3.client('s3', region_name=os.environ.get('AWS_REGION'),
+                        config=BOTO_CONFIG.merge(S3_CONFIG))
+
+
+@lru_cache(maxsize=None)
+def get_table():
+    """
+    Returns the DynamoDB table shared by every invocation in this container.
+
+    Returns:
+        boto3.resources.base.ServiceResource: The judgements table.
+    """
+    return boto3.resource('dynamodb', config=BOTO_CONFIG).Table(TABLE_NAME)
+
+
+def warm_connections():
+    """
+    Opens connections to the DS API and S3 during Lambda init.
+
+    The handshakes are paid in the init phase rather than on the first record,
+    and one DS API connection is opened per worker so that every slot in the
+    pool is warm. The DS API requests are not retried, and the S3 request runs
+    on a daemon thread that init only waits for up to WARM_UP_BUDGET seconds,
+    so an unreachable endpoint cannot stall init. Failures are ignored since
+    this is only an optimisation.
+
+    Returns:
+        None
+    """
+    # Create the clients up front so worker threads never race to build them
+    get_s3_client()
+    get_table()
+
+    def head_input_bucket():
+        try:
+            get_s3_client().head_bucket(Bucket=INPUT_BUCKET_NAME)
+        except (BotoCoreError, ClientError) as e:
+            logger.warning("S3 warm-up failed: %s", e)
+
+    # Warm the real S3 client in the background; init waits at most WARM_UP_BUDGET
+    deadline = time.monotonic() + WARM_UP_BUDGET
+    s3_warm_up = Thread(target=head_input_bucket, daemon=True)
+    s3_warm_up.start()
+    warm_up(DS_API_URL, connections=MAX_WORKERS, timeout=WARM_UP_TIMEOUT)
+    s3_warm_up.join(max(0, deadline - time.monotonic()))
+
+
+warm_connections()
+
 
 def lambda_handler(event, _):
     """
     AWS Lambda handler function.
 
     Processes incoming SQS events containing URLs, downloads the corresponding
-    PDF files, and uploads them to an S3 bucket.
+    PDF files, and uploads them to an S3 bucket. Records are processed
+    concurrently, and failed records are reported back to SQS so that only
+    they are redelivered (requires ReportBatchItemFailures on the trigger).
 
     Args:
         event (dict): The event data passed to the Lambda function, typically
@@ -57,24 +200,49 @@ def lambda_handler(event, _):
         _ (object): The Lambda context object (not used in this function).
 
     Returns:
-        None
+        dict: A partial batch response listing the failed message IDs.
     """
-    # pylint: disable=broad-exception-raised
-    raise Exception("This function is not ready to be deployed yet.")
-    # pylint: disable=unreachable
-    print(event)
+    logger.debug("Received event: %s", event)
 
     records = event['Records']
-    for record in records:
+    if not records:
+        return {"batchItemFailures": []}
+
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(records))) as executor:
+        results = list(executor.map(try_process_record, records))
+
+    return {
+        "batchItemFailures": [
+            {"itemIdentifier": record['messageId']}
+            for record, succeeded in zip(records, results) if not succeeded
+        ]
+    }
+
+def try_process_record(record):
+    """
+    Processes a single SQS record, catching any error it raises.
+
+    Args:
+        record (dict): A single SQS message.
+
+    Returns:
+        bool: True if the record was processed successfully, else False.
+    """
+    try:
         process_record(record)
+        return True
+    # pylint: disable=broad-exception-caught
+    except Exception:
+        logger.exception("Error processing message %s", record.get('messageId'))
+        return False
 
 def process_record(record):
     """
     Processes a single SQS record.
 
-    Downloads the PDF file from the URL specified in the record, uploads it
-    to the specified S3 bucket, calls the DS API to get a job ID, and updates
-    the DynamoDB table with the job status.
+    Downloads the PDF file from the URL specified in the record and uploads it
+    to the specified S3 bucket while calling the DS API to get a job ID, then
+    updates the DynamoDB table with the job status.
 
     Args:
         record (dict): A single SQS message containing a 'body' key with the URL.
@@ -82,31 +250,179 @@ def process_record(record):
     Returns:
         None
     """
-    record_body = json.loads(record['body'])
+    record_body = orjson.loads(record['body'])
     url = record_body.get('judgementPdfLink')
     if not url:
-        print("Missing judgement URL.")
+        logger.warning("Missing judgement URL.")
         return
 
-    # Create pdf and store in S3
+    file_id = get_unique_id_from_url(url)
+    if is_already_processed(file_id):
+        logger.info("Entry %s already has a job ID, skipping.", file_id)
+        return
+
+    path_end = get_path_end(url)
+    filename = path_end if path_end.endswith('.pdf') else path_end + '.pdf'
+
+    # The DS API only needs the S3 path, so upload the PDF while requesting the job id
+    upload = UPLOAD_EXECUTOR.submit(upload_pdf, url, filename)
     try:
-        response = requests.get(url, timeout=5)
-        response.raise_for_status()
-        pdf_data = response.content
+        job_id = request_job_id(filename)
+    finally:
+        # Lambda freezes once the handler returns, so never leave the upload running
+        wait([upload])
+    upload.result()
 
-        filename = os.path.basename(urlparse(url).path)
-        if not filename.endswith('.pdf'):
-            filename += '.pdf'
+    # Populate DynamoDB with the job ID
+    try:
+        write_job(file_id, job_id)
+        remember_processed(file_id)
+        logger.info("Updated entry %s in DynamoDB", file_id)
+
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            remember_processed(file_id)
+            logger.info("Entry %s was already updated by another delivery.", file_id)
+            return
+        logger.error("Error inserting into DynamoDB: %s", e)
+        raise
+    except BotoCoreError as e:
+        logger.error("Error inserting into DynamoDB: %s", e)
+        raise
+
+
+def write_job(file_id, job_id):
+    """
+    Records the job ID of a judgement in DynamoDB using the configured
+    WRITE_MODE. Only the first delivery of a message may set the job ID.
 
-        s3.put_object(Bucket=INPUT_BUCKET_NAME, Key=f'judgements/{filename}',
-                      Body=pdf_data, ContentType='application/pdf')
-        print(f"Uploaded {filename} to s3://{INPUT_BUCKET_NAME}/judgements/{filename}")
-    # pylint: disable=broad-exception-caught
-    except Exception as e:
-        print(f"Error calling {url}: {e}")
-        raise e
+    Args:
+        file_id (str): The unique ID of the judgement.
+        job_id (str): The job ID returned by the DS API.
+
+    Returns:
+        None
 
-    # Call DS API to get the job id
+    Raises:
+        botocore.exceptions.ClientError: With ConditionalCheckFailedException
+            if the judgement already has a job ID.
+    """
+    status = "pending ocr"
+
+    if WRITE_MODE == 'put':
+        get_table().put_item(
+            Item={
+                'uniqueId': file_id,
+                'status': status,
+                'jobId': job_id
+            },
+            ConditionExpression='attribute_not_exists(jobId)'
+        )
+        return
+
+    get_table().update_item(
+        Key={
+            'uniqueId': file_id
+        },
+        UpdateExpression='SET #status = :status, #job = :job',
+        ConditionExpression='attribute_not_exists(#job)',
+        ExpressionAttributeNames={
+            '#status': 'status',
+            '#job': 'jobId'
+        },
+        ExpressionAttributeValues={
+            ':status': status,
+            ':job': job_id
+        }
+    )
+
+def remember_processed(file_id):
+    """
+    Caches a judgement ID as having a job ID, evicting the least recently used
+    ID once MAX_PROCESSED_IDS are cached.
+
+    Args:
+        file_id (str): The unique ID of the judgement.
+
+    Returns:
+        None
+    """
+    with PROCESSED_IDS_LOCK:
+        PROCESSED_IDS[file_id] = True
+        PROCESSED_IDS.move_to_end(file_id)
+        if len(PROCESSED_IDS) > MAX_PROCESSED_IDS:
+            PROCESSED_IDS.popitem(last=False)
+
+
+def is_already_processed(file_id):
+    """
+    Checks whether a judgement already has a job ID, so that SQS redeliveries
+    skip the download and DS API call.
+
+    IDs seen in this container are cached, otherwise only the jobId attribute
+    is fetched from DynamoDB. If that read fails the judgement is treated as
+    unprocessed, since the conditional write in write_job keeps it idempotent.
+
+    Args:
+        file_id (str): The unique ID of the judgement.
+
+    Returns:
+        bool: True if the judgement already has a job ID, else False.
+    """
+    with PROCESSED_IDS_LOCK:
+        if file_id in PROCESSED_IDS:
+            PROCESSED_IDS.move_to_end(file_id)
+            return True
+    try:
+        response = get_table().get_item(Key={'uniqueId': file_id}, ProjectionExpression='jobId')
+    except (BotoCoreError, ClientError) as e:
+        # The conditional write still prevents duplicates, so carry on
+        logger.warning("Could not check DynamoDB for entry %s: %s", file_id, e)
+        return False
+    if 'jobId' in response.get('Item', {}):
+        remember_processed(file_id)
+        return True
+    return False
+
+
+def upload_pdf(url, filename):
+    """
+    Downloads the PDF file from the given URL and streams it into the input
+    S3 bucket.
+
+    Args:
+        url (str): The URL of the PDF file.
+        filename (str): The name under which the PDF is stored in S3.
+
+    Returns:
+        None
+    """
+    try:
+        # Stream the download straight into S3 instead of buffering it
+        with SESSION.get(url, stream=True, timeout=(5, 30)) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            get_s3_client().upload_fileobj(
+                response.raw, INPUT_BUCKET_NAME, f'judgements/{filename}',
+                ExtraArgs={'ContentType': 'application/pdf'},
+                Config=TRANSFER_CONFIG
+            )
+        logger.info("Uploaded %s to s3://%s/judgements/%s", filename, INPUT_BUCKET_NAME, filename)
+    except (requests.RequestException, BotoCoreError, ClientError, S3UploadFailedError) as e:
+        logger.error("Error calling %s: %s", url, e)
+        raise
+
+
+def request_job_id(filename):
+    """
+    Calls the DS API to create a job for the given PDF file.
+
+    Args:
+        filename (str): The name of the PDF file in the input S3 bucket.
+
+    Returns:
+        str: The job ID returned by the DS API.
+    """
     try:
         # S3 path of the uploaded input file
         input_file_path = f"s3://{INPUT_BUCKET_NAME}/judgements/{filename}"
@@ -118,47 +434,32 @@ def process_record(record):
             # REMOVE THIS LINE
             "job_id": "1234"
         }
-        ds_response = requests.post(DS_API_URL, json=payload, timeout=5)
+        ds_response = SESSION.post(DS_API_URL, data=orjson.dumps(payload),
+                                   headers={'Content-Type': 'application/json'},
+                                   timeout=5)
         ds_response.raise_for_status()
 
         # REPLACE WITH ACTUAL JOB ID
-        job_id = ds_response.json().get("job_id")
+        job_id = orjson.loads(ds_response.content).get("job_id")
 
-        print(f"Received job ID: {job_id}")
-    # pylint: disable=broad-exception-caught
-    except Exception as e:
-        print(f"Error calling {DS_API_URL}: {e}")
-        raise e
+        logger.info("Received job ID: %s", job_id)
+        return job_id
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
+        logger.error("Error calling %s: %s", DS_API_URL, e)
+        raise
 
-    # Populate DynamoDB with the job ID
-    try:
-        file_id = get_unique_id_from_url(url)
-        status = "pending ocr"
 
-        response = table.update_item(
-            Key={
-                'uniqueId': file_id
-            },
-            UpdateExpression='SET #status = :status, #job = :job',
-            ExpressionAttributeNames={
-                '#status': 'status',
-                '#job': 'jobId'
-            },
-            ExpressionAttributeValues={
-                ':status': status,
-                ':job': job_id
-            },
-            ReturnValues='UPDATED_NEW'
-        )
+def get_path_end(url: str) -> str:
+    """
+    Returns the last path segment of a URL, without query string or fragment.
 
-        print(
-            f"Updated entry {file_id} in DynamoDB"
-        )
+    Args:
+        url (str): The URL to take the last path segment from.
 
-    # pylint: disable=broad-exception-caught
-    except Exception as e:
-        print(f"Error inserting into DynamoDB: {e}")
-        raise e
+    Returns:
+        str: The last path segment of the URL.
+    """
+    return url.split('?', 1)[0].split('#', 1)[0].rsplit('/', 1)[-1]
 
 
 def get_unique_id_from_url(url: str):
@@ -174,10 +475,11 @@ def get_unique_id_from_url(url: str):
     Returns:
         str: A unique ID in the format "diary_no_date".
     """
-    filename = url.split("/")[-1]
-    split = filename.split("_")
-    diary_no = split[0] + split[1]
-    date = format_date(split[-1][:-4])
+    match = JUDGEMENT_FILENAME_RE.fullmatch(get_path_end(url))
+    if match is None:
+        raise ValueError(f"Unexpected judgement filename in URL '{url}'")
+    diary_no = match.group(1) + match.group(2)
+    date = format_date(match.group(3))
     return f"{diary_no}_{date}"
 
 
@@ -190,6 +492,15 @@ def format_date(date_str: str) -> str:
 
     Returns:
         str: The formatted date string in "yyyy-MM-dd" format.
+
+    Raises:
+        ValueError: If the month is unknown or the day does not exist in it.
     """
-    date_obj = datetime.strptime(date_str, "%d-%b-%Y")
-    return date_obj.strftime("%Y-%m-%d")
+    day, month, year = date_str.split("-")
+    month_no = MONTHS.get(month.title())
+    if month_no is None:
+        raise ValueError(f"Unknown month in date '{date_str}'")
+    day_no, year_no = int(day), int(year)
+    if not 1 <= day_no <= calendar.monthrange(year_no, month_no)[1]:
+        raise ValueError(f"Day out of range in date '{date_str}'")
+    return f"{year_no:04d}-{month_no:02d}-{day_no:02d}"
@@ -6,8 +6,28 @@ It uses the default AWS credential resolution chain to securely obtain credentia
 and provides error handling for common issues such as missing files or invalid credentials.
 """
 
+import io
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import NoCredentialsError, PartialCredentialsError
+from aws_config import BOTO_CONFIG
+
+# PDFs of 8 MiB or more are uploaded in concurrent 16 MiB parts
+UPLOAD_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=16 * 1024 * 1024,
+    max_concurrency=8,
+    use_threads=True
+)
+
+# Large objects are downloaded with concurrent byte-range GETs
+DOWNLOAD_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=16,
+    io_chunksize=1024 * 1024,
+    use_threads=True
+)
 
 class S3Client:
     """
@@ -21,19 +41,22 @@ class S3Client:
         The credentials are automatically resolved from environment variables,
         AWS credentials file, IAM roles, or other supported methods.
         """
-        self.s3 = boto3.client('s3')
+        self.s3 = boto3.client('s3', config=BOTO_CONFIG)
 
     def download_file(self, bucket_name, object_name, file_name):
         """
         Download a file from an S3 bucket.
 
+        Large objects are fetched as parallel byte-range requests.
+
         :param bucket_name: Name of the S3 bucket
         :param object_name: S3 object name
         :param file_name: Path to save the downloaded file
         :return: True if the file was downloaded successfully, else False
         """
         try:
-            self.s3.download_file(bucket_name, object_name, file_name)
+            self.s3.download_file(bucket_name, object_name, file_name,
+                                  Config=DOWNLOAD_TRANSFER_CONFIG)
             print(f"File {object_name} downloaded from {bucket_name} to {file_name}")
             return True
         except FileNotFoundError:
@@ -50,14 +73,17 @@ class S3Client:
         """
         Upload PDF data directly to an S3 bucket.
 
+        Large PDFs are uploaded as a multipart upload with parts sent in parallel.
+
         :param pdf_data: Binary data of the PDF file
         :param bucket_name: Name of the S3 bucket
         :param object_name: S3 object name (key) where the PDF will be stored
         :return: True if the PDF data was uploaded successfully, else False
         """
         try:
-            self.s3.put_object(Bucket=bucket_name, Key=object_name,
-                               Body=pdf_data, ContentType=content_type)
+            self.s3.upload_fileobj(io.BytesIO(pdf_data), bucket_name, object_name,
+                                   ExtraArgs={'ContentType': content_type},
+                                   Config=UPLOAD_TRANSFER_CONFIG)
             print(f"PDF data uploaded to {bucket_name}/{object_name}")
             return True
         except NoCredentialsError: